@@ -1,15 +1,24 @@
+import io
+import os
+import mmap
+import queue
 import struct
 import threading
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import tempfile
 import pygame
 import wave
-import io
-from collections import defaultdict
+from array import array
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import time
 
+try:
+    import numpy as np
+except ImportError:  # optional: speeds up stream (de)cryption
+    np = None
+
 # Constants
 ENCODE_KEY = bytes.fromhex('EA3AC4A19AA814F348B0D7239DE8FFF1')
 TRACK_HEADER_SIZE = 8068
@@ -17,6 +26,35 @@ CONFIG_DIR = 'audio/CONFIG'
 SFX_DIR = 'audio/SFX'
 BANK_HEADER_SIZE = 4804
 DEFAULT_SAMPLE_RATE = 22050  # fallback rate for invalid values
+XOR_CHUNK_SIZE = 4 << 20  # bytes XORed between progress reports
+IO_WORKERS = min(8, os.cpu_count() or 1)  # concurrent file writes (export all, SFX rebuild)
+WAV_CACHE_SIZE = 64  # recently played SFX kept wrapped as WAV
+SOUND_CACHE_SIZE = 32  # recently played SFX kept as pygame Sounds
+PROGRESS_INTERVAL_MS = 16  # progress bar refreshes at most this often
+TIME_POLL_MS = 250  # playback position/time label refresh interval
+SEEK_DEBOUNCE_MS = 120  # seek once a slider has been still this long
+MIXER_BUFFER = 512  # mixer buffer in samples; smaller starts sounds sooner
+OGG_TAIL_SCAN = 64 << 10  # bytes searched from the end for the last Ogg page
+KEY_TILE_SIZE = 64 << 10  # key repeated to this size for bulk slice XOR
+_KEY_TILE = ENCODE_KEY * (KEY_TILE_SIZE // len(ENCODE_KEY))
+# Per key position, a bytes.translate table mapping b -> b ^ key[j]
+_XOR_TABLES = [bytes(b ^ k for b in range(256)) for k in ENCODE_KEY]
+
+# Precompiled unpackers for the hot parse loops
+_UNPACK_TRACK_SLOTS = struct.Struct('<16I').unpack_from  # 8 x (length, ?)
+_BANK_ENTRY = struct.Struct('<IIHH')  # buf_off, ?, rate, ?
+_UNPACK_H = struct.Struct('<H').unpack_from
+_UNPACK_I = struct.Struct('<I').unpack_from
+_UNPACK_Q = struct.Struct('<q').unpack_from
+_BANK_LOOKUP = struct.Struct('<B3xII')  # BankLkup.dat: pkg_idx, offset, size
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')  # RIFF/WAVE header
+
+# SFX bank header: <H count>, 2 pad bytes, then 12-byte sound entries
+MAX_BANK_SOUNDS = (BANK_HEADER_SIZE - 4) // 12
+if np is not None:
+    _BANK_ENTRY_DT = np.dtype([
+        ('buf_off', '<u4'), ('_', '<u4'), ('rate', '<u2'), ('__', '<u2')
+    ])
 
 # Background task runner
 def run_in_thread(fn):
@@ -24,22 +62,176 @@ def run_in_thread(fn):
         threading.Thread(target=lambda: fn(*args, **kwargs), daemon=True).start()
     return wrapper
 
-def xor_in_place_simple(data: bytearray, key: bytes, progress_callback=None):
+def export_parallel(export, count, out_dir, progress_callback=None):
+    """
+    Call export(i, out_dir) for every index on a thread pool; file writes
+    release the GIL, so several can be in flight at once.
+    Calls progress_callback(done, count) as exports finish, in order.
+    """
+    with ThreadPoolExecutor(max_workers=IO_WORKERS) as ex:
+        done = ex.map(lambda i: export(i, out_dir), range(count))
+        for i, _ in enumerate(done, 1):
+            if progress_callback:
+                progress_callback(i, count)
+
+def _key_tile(key: bytes) -> bytes:
+    """`key` repeated to about KEY_TILE_SIZE bytes (precomputed for ENCODE_KEY)."""
+    if key == ENCODE_KEY:
+        return _KEY_TILE
+    return key * max(1, KEY_TILE_SIZE // len(key))
+
+def _xor_tables(key: bytes) -> list:
+    """bytes.translate tables XORing with each byte of `key` (precomputed for ENCODE_KEY)."""
+    if key == ENCODE_KEY:
+        return _XOR_TABLES
+    return [bytes(b ^ k for b in range(256)) for k in key]
+
+
+def xor_in_place(data: bytearray, key: bytes, progress_callback=None):
     """
-    XOR-decrypt `data` in place using `key` in one single pass.
+    XOR-decrypt (or re-encrypt) `data` in place using `key` in one single
+    pass. This is the one kernel every stream read/write path goes through.
     Calls progress_callback(processed_bytes, total_bytes) periodically.
     """
+    if np is not None:
+        _xor_numpy(data, key, progress_callback)
+    else:
+        _xor_python(data, key, progress_callback)
+
+
+def _xor_python(data: bytearray, key: bytes, progress_callback=None):
+    """
+    Pure-Python variant of xor_in_place: works through one key tile at a
+    time, translating every key position's strided slice with a lookup table.
+    """
     total = len(data)
     klen = len(key)
-    processed = 0
-    last_report = 0
+    tables = _xor_tables(key)
+    # Blocks are a whole number of key lengths, so slice j always meets key[j]
+    step = len(_key_tile(key))
+
+    with memoryview(data) as mv:
+        for off in range(0, total, step):
+            end = min(off + step, total)
+            block = bytearray(mv[off:end])
+            for j, table in enumerate(tables):
+                block[j::klen] = block[j::klen].translate(table)
+            mv[off:end] = block
+            if progress_callback:
+                progress_callback(end, total)
 
-    for i in range(total):
-        data[i] ^= key[i % klen]
-        processed += 1
-        if progress_callback and (processed - last_report >= 4096):
-            last_report = processed
-            progress_callback(processed, total)
+    # Final callback to indicate completion
+    if progress_callback:
+        progress_callback(total, total)
+
+
+def _xor_numpy(data: bytearray, key: bytes, progress_callback=None):
+    """
+    Vectorized variant of xor_in_place. Works on a zero-copy
+    uint8 view of `data`, one XOR_CHUNK_SIZE slice at a time, broadcasting
+    the key tile across whole tile-sized rows.
+    """
+    arr = np.frombuffer(data, dtype=np.uint8)
+    total = arr.size
+    tile = np.frombuffer(_key_tile(key), dtype=np.uint8)
+    # Slices are whole tiles long, so each one starts at key phase 0
+    step = XOR_CHUNK_SIZE - XOR_CHUNK_SIZE % tile.size
+
+    for start in range(0, total, step):
+        chunk = arr[start : start + step]
+        whole = chunk.size - chunk.size % tile.size
+        rows = chunk[:whole].reshape(-1, tile.size)
+        np.bitwise_xor(rows, tile, out=rows)
+        np.bitwise_xor(chunk[whole:], tile[: chunk.size - whole], out=chunk[whole:])
+        if progress_callback:
+            progress_callback(start + chunk.size, total)
+
+    if progress_callback:
+        progress_callback(total, total)
+
+
+def xor_into(dst, pos, src, key: bytes):
+    """
+    Copy `src` into `dst` at `pos`, XOR-encrypting it on the way with the
+    key phase an XOR of the whole of `dst` would use at that position.
+    """
+    n = len(src)
+    klen = len(key)
+    phase = pos % klen
+    key = key[phase:] + key[:phase]
+
+    if np is None:
+        dst[pos : pos + n] = src
+        xor_in_place(memoryview(dst)[pos : pos + n], key)
+        return
+
+    out = np.frombuffer(dst, dtype=np.uint8)[pos : pos + n]
+    src_arr = np.frombuffer(src, dtype=np.uint8)
+    key_arr = np.frombuffer(key, dtype=np.uint8)
+    aligned = n - n % klen
+    # Broadcast the key across whole key-sized rows, then finish the tail
+    np.bitwise_xor(
+        src_arr[:aligned].reshape(-1, klen), key_arr,
+        out=out[:aligned].reshape(-1, klen)
+    )
+    np.bitwise_xor(src_arr[aligned:], key_arr[: n - aligned], out=out[aligned:])
+
+
+def read_and_xor(f, data: bytearray, key: bytes, progress_callback=None):
+    """
+    Fill `data` from the binary file `f` and XOR-decrypt it in place.
+    A reader thread reads ahead block by block while the calling thread
+    decrypts the blocks already read, so disk I/O overlaps the XOR.
+    Calls progress_callback(decrypted_bytes, total_bytes) per block.
+    """
+    total = len(data)
+    # Blocks are whole keys long, so each one starts at key phase 0
+    step = XOR_CHUNK_SIZE - XOR_CHUNK_SIZE % len(key)
+    ready = queue.Queue(maxsize=4)
+    stop = threading.Event()  # set when the decrypting side gives up
+
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+    def reader():
+        try:
+            with memoryview(data) as mv:
+                for start in range(0, total, step):
+                    if stop.is_set():
+                        return
+                    end = min(start + step, total)
+                    f.readinto(mv[start:end])
+                    ready.put((start, end))
+        except Exception as e:
+            ready.put(e)
+        else:
+            ready.put(None)
+
+    reader_thread = threading.Thread(target=reader, daemon=True)
+    reader_thread.start()
+
+    try:
+        with memoryview(data) as mv:
+            while True:
+                block = ready.get()
+                if block is None:
+                    break
+                if isinstance(block, Exception):
+                    raise block
+                start, end = block
+                xor_in_place(mv[start:end], key)
+                if progress_callback:
+                    progress_callback(end, total)
+    finally:
+        # If decrypting failed, stop the reader and drain the queue so a
+        # blocked put() returns; it must be done with `data` and `f` before
+        # we leave
+        stop.set()
+        while reader_thread.is_alive():
+            try:
+                ready.get_nowait()
+            except queue.Empty:
+                reader_thread.join(0.05)
 
     # Final callback to indicate completion
     if progress_callback:
@@ -50,32 +242,31 @@ class StreamArchive:
     def __init__(self, path, progress_callback=None):
         self.filepath = Path(path)
         self.tracks = []
+        self._decoded = bytearray()  # decrypted file; tracks are views into it
         self._decode_and_parse(progress_callback)
 
     def _decode_and_parse(self, progress_callback):
-        # Read entire encrypted file into a bytearray
-        raw = self.filepath.read_bytes()
-        data = bytearray(raw)
+        # Read the encrypted file straight into a single buffer. It is kept
+        # in memory rather than mapped, because a live mapping would lock
+        # the file against rebuild() on Windows.
+        with open(self.filepath, 'rb') as f:
+            data = bytearray(os.fstat(f.fileno()).st_size)
+            # Decrypt each block while the next one is still being read
+            read_and_xor(f, data, ENCODE_KEY, progress_callback)
+        self._decoded = data
         total = len(data)
-        key = ENCODE_KEY
-
-        # Decrypt in place using single-pass XOR
-        xor_in_place_simple(data, key, progress_callback)
 
-        # Now parse decrypted data into tracks
+        # Now parse decrypted data into tracks, as zero-copy views
         mv = memoryview(data)
         offset = 0
         idx = 1
+        unpack_slots = _UNPACK_TRACK_SLOTS
 
         while offset + TRACK_HEADER_SIZE <= total:
             hdr = mv[offset : offset + TRACK_HEADER_SIZE]
+            # Length is the first of the 8 slots at 8000 not filled with 0xCD
             length = 0
-            base = 8000
-            for j in range(8):
-                try:
-                    l, _ = struct.unpack_from('<II', hdr, base + j * 8)
-                except struct.error:
-                    continue
+            for l in unpack_slots(hdr, 8000)[::2]:
                 if l != 0xCDCDCDCD:
                     length = l
                     break
@@ -86,8 +277,8 @@ class StreamArchive:
                 break
 
             self.tracks.append({
-                'header': bytes(hdr),
-                'data': bytes(mv[start:end]),
+                'header': hdr,
+                'data': mv[start:end],
                 'name': f"{self.filepath.stem}_{idx}"
             })
 
@@ -100,58 +291,142 @@ class StreamArchive:
         out_path.write_bytes(t['data'])
 
     def export_all(self, out_dir, progress_callback=None):
-        total = len(self.tracks)
-        for i in range(total):
-            self.export(i, out_dir)
-            if progress_callback:
-                progress_callback(i + 1, total)
+        export_parallel(self.export, len(self.tracks), out_dir, progress_callback)
 
     def replace(self, idx, newfile):
         self.tracks[idx]['data'] = Path(newfile).read_bytes()
 
     def rebuild(self, progress_callback=None):
         total = sum(TRACK_HEADER_SIZE + len(t['data']) for t in self.tracks)
-        buf = bytearray(total)
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        fd = os.open(self.filepath, flags)
+        try:
+            os.ftruncate(fd, total)
+            if not total:
+                return
+            # Fill and re-encrypt the mapped file directly; dirty pages are
+            # written back by the OS instead of via a full-size bytearray
+            with mmap.mmap(fd, total, access=mmap.ACCESS_WRITE) as buf:
+                self._write_tracks(buf, total, progress_callback)
+                buf.flush()
+        finally:
+            os.close(fd)
+
+    def _write_tracks(self, buf, total, progress_callback):
         write_ptr = 0
         count = 0
 
-        # Rebuild the decrypted buffer (headers + data)
+        # Encrypt headers + data as they are copied, one pass per byte
         for t in self.tracks:
             hdr = t['header']
             d = t['data']
-            buf[write_ptr : write_ptr + len(hdr)] = hdr
+            xor_into(buf, write_ptr, hdr, ENCODE_KEY)
             write_ptr += len(hdr)
             count += len(hdr)
             if progress_callback:
                 progress_callback(count, total)
 
-            buf[write_ptr : write_ptr + len(d)] = d
+            xor_into(buf, write_ptr, d, ENCODE_KEY)
             write_ptr += len(d)
             count += len(d)
             if progress_callback:
                 progress_callback(count, total)
 
-        # Re-encrypt entire buffer in place
-        key = ENCODE_KEY
-        klen = len(key)
-        total_buf = len(buf)
-        processed = 0
-        last_report = 0
-
-        for offset in range(0, total_buf, klen):
-            chunk_size = min(klen, total_buf - offset)
-            for j in range(chunk_size):
-                buf[offset + j] ^= key[j]
-            processed += chunk_size
-            if progress_callback and (processed - last_report >= 4096):
-                last_report = processed
-                progress_callback(min(processed, total_buf), total_buf)
-
-        # Final callback
-        if progress_callback:
-            progress_callback(total_buf, total_buf)
 
-        self.filepath.write_bytes(buf)
+def wav_header(n_bytes, rate):
+    """RIFF/WAVE header for `n_bytes` of mono 16-bit PCM at `rate` Hz."""
+    return _WAV_HEADER.pack(
+        b'RIFF', 36 + n_bytes, b'WAVE',
+        b'fmt ', 16, 1, 1, rate, rate * 2, 2, 16,
+        b'data', n_bytes
+    )
+
+
+def ogg_duration(data):
+    """
+    Length in seconds of an Ogg Vorbis file, read from the granule position
+    of its last page and the rate in the identification header, without
+    decoding any audio. Returns None if either cannot be found.
+    """
+    head = bytes(data[:128])
+    ident = head.find(b'\x01vorbis')
+    if ident < 0 or ident + 16 > len(head):
+        return None
+    rate = _UNPACK_I(head, ident + 12)[0]
+    if not rate:
+        return None
+
+    # Walk back from the end to the last page that completes a packet
+    tail = bytes(data[max(0, len(data) - OGG_TAIL_SCAN):])
+    page = tail.rfind(b'OggS')
+    while page >= 0:
+        if page + 14 <= len(tail) and tail[page + 4] == 0:
+            granule = _UNPACK_Q(tail, page + 6)[0]
+            if granule >= 0:
+                return granule / rate
+        page = tail.rfind(b'OggS', 0, page)
+    return None
+
+
+def _parse_bank_sounds(hdr, size, avail):
+    """
+    Parse the sound table of an SFX bank header.
+    Returns (index, buf_off, rate, length) for every sound whose PCM fits in
+    the `avail` bytes after the header. A sound runs up to the next sound's
+    offset, or to the bank `size` for the last one.
+    """
+    count = _UNPACK_H(hdr, 0)[0]
+    n = min(count, MAX_BANK_SOUNDS)
+
+    if np is not None:
+        entries = np.frombuffer(hdr, dtype=_BANK_ENTRY_DT, count=n, offset=4)
+        buf_offs = entries['buf_off'].astype(np.int64)
+        # A table cut short by the header size has no end for its last sound
+        last = size if n == count else (buf_offs[-1] if n else 0)
+        lengths = np.diff(buf_offs, append=last)
+        valid = np.flatnonzero((lengths > 0) & (buf_offs + lengths <= avail))
+        return list(zip(
+            valid.tolist(),
+            buf_offs[valid].tolist(),
+            entries['rate'][valid].tolist(),
+            lengths[valid].tolist(),
+        ))
+
+    sounds = []
+    entries = list(_BANK_ENTRY.iter_unpack(hdr[4 : 4 + n * 12]))
+    for si, (buf_off, _, rate, _) in enumerate(entries):
+        if si + 1 < n:
+            nxt = entries[si + 1][0]
+        elif si < count - 1:
+            nxt = buf_off  # table cut short by the header size
+        else:
+            nxt = size
+
+        length = nxt - buf_off
+        if length > 0 and buf_off + length <= avail:
+            sounds.append((si, buf_off, rate, length))
+    return sounds
+
+
+class _SoundRows:
+    """List-like view of an SFXArchive's columns; each row is built on access."""
+
+    def __init__(self, arc):
+        self._arc = arc
+
+    def __len__(self):
+        return len(self._arc.names)
+
+    def __getitem__(self, idx):
+        a = self._arc
+        return {
+            'pkg_file': a.pkg_files[idx],
+            'header_off': a.header_offs[idx],
+            'pcm_offset': a.pcm_offsets[idx],
+            'pcm': a.get_pcm(idx),
+            'rate': a.rates[idx],
+            'name': a.names[idx]
+        }
 
 
 class SFXArchive:
@@ -159,10 +434,27 @@ class SFXArchive:
         self.root = Path(root)
         self.config = self.root / CONFIG_DIR
         self.sfx = self.root / SFX_DIR
-        self.sounds = []
+        # Sound metadata is kept column-wise, one entry per sound in each
+        # list; sounds[idx] still yields the per-sound dict when needed
+        self.pkg_files = []
+        self.header_offs = array('Q')
+        self.pcm_offsets = array('Q')
+        self.pcm_lengths = array('Q')
+        self.rates = array('H')
+        self.names = []
+        self.sounds = _SoundRows(self)
+        # PCM stays in the package files and is read by get_pcm(); only
+        # replacements are held in memory
+        self._replaced = {}  # idx -> replacement PCM bytes
+        self._wav_cache = OrderedDict()  # idx -> wav bytes, least recent first
+        self._dirty = set()  # indices replaced since the last rebuild
         self._load(progress_callback)
 
     def _load(self, progress_callback):
+        # BankLkup.dat is grouped by package once up front (bank_map), so
+        # each package only visits its own banks - never rescan all entries
+        # per package. Banks are kept in file-offset order so header reads
+        # walk each package front to back.
         if not self.config.exists():
             messagebox.showerror('Error', f"CONFIG folder not found:\n{self.config}")
             return
@@ -174,13 +466,13 @@ class SFXArchive:
             messagebox.showerror('Error', f"PakFiles.dat not found in {self.config}")
             return
 
-        packages = []
+        # One null-padded 52-byte name per package
         entry_size = 52
-        for i in range(0, len(pak_data), entry_size):
-            raw_name = pak_data[i : i + entry_size]
-            name = raw_name.split(b'\x00', 1)[0].decode(errors='ignore')
-            if name:
-                packages.append(name)
+        names = (
+            pak_data[i : i + entry_size].partition(b'\x00')[0].decode(errors='ignore')
+            for i in range(0, len(pak_data), entry_size)
+        )
+        packages = [name for name in names if name]
 
         bl_path = self.config / 'BankLkup.dat'
         try:
@@ -191,107 +483,137 @@ class SFXArchive:
 
         # Cache bank entries by package index
         bank_map = defaultdict(list)  # pkg_idx -> list of (off, size)
-        fmt = '<B3xII'
-        for pkg_idx, off, size in struct.iter_unpack(fmt, bl_data):
+        for pkg_idx, off, size in _BANK_LOOKUP.iter_unpack(bl_data):
             bank_map[pkg_idx].append((off, size))
+        for banks in bank_map.values():
+            banks.sort()
+
+        # One directory scan instead of an exists() stat per package
+        try:
+            pkg_files = {
+                os.path.normcase(e.name): Path(e.path)
+                for e in os.scandir(self.sfx) if e.is_file()
+            }
+        except FileNotFoundError:
+            pkg_files = {}
 
         total_pkgs = len(packages)
         for pi, pkg_name in enumerate(packages):
             if progress_callback:
                 progress_callback(pi, total_pkgs)
 
-            pfile = self.sfx / pkg_name
-            if not pfile.exists():
+            pfile = pkg_files.get(os.path.normcase(pkg_name))
+            if pfile is None:
                 continue
 
-            data = pfile.read_bytes()
-            data_len = len(data)
-            mv_data = memoryview(data)
-
-            # Look up entries for this package directly
-            for off, size in bank_map.get(pi, []):
-                if off < 0 or off + BANK_HEADER_SIZE > data_len:
-                    continue
-
-                hdr = mv_data[off : off + BANK_HEADER_SIZE]
-                try:
-                    count = struct.unpack_from('<H', hdr, 0)[0]
-                except struct.error:
+            # Map the package read-only so only the pages holding bank
+            # headers get read. The map is closed again right away: no file
+            # stays open or mapped after loading.
+            with open(pfile, 'rb') as f:
+                if not os.fstat(f.fileno()).st_size:
                     continue
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            with data:
+                # Look up entries for this package directly
+                self._load_banks(pfile, pkg_name, data, bank_map.get(pi, ()))
+
+    def _load_banks(self, pfile, pkg_name, data, banks):
+        data_len = len(data)
+        # Column appends bound once for the per-sound loop
+        add_pkg_file = self.pkg_files.append
+        add_header_off = self.header_offs.append
+        add_pcm_offset = self.pcm_offsets.append
+        add_pcm_length = self.pcm_lengths.append
+        add_rate = self.rates.append
+        add_name = self.names.append
+
+        for off, size in banks:
+            pcm_base = off + BANK_HEADER_SIZE
+            if off < 0 or pcm_base > data_len:
+                continue
 
-                for si in range(count):
-                    base = 4 + si * 12
-                    if base + 12 > len(hdr):
-                        break
-
-                    buf_off, _, rate, _ = struct.unpack_from('<IIHH', hdr, base)
-                    pcm_start = off + BANK_HEADER_SIZE + buf_off
-
-                    if si < count - 1:
-                        try:
-                            nxt = struct.unpack_from('<I', hdr, base + 12)[0]
-                        except struct.error:
-                            nxt = buf_off
-                    else:
-                        nxt = size
-
-                    length = nxt - buf_off
-                    if length <= 0 or pcm_start + length > data_len:
-                        continue
-
-                    pcm = bytes(mv_data[pcm_start : pcm_start + length])
-                    self.sounds.append({
-                        'pkg_file': pfile,
-                        'header_off': off,
-                        'pcm_offset': buf_off,
-                        'pcm': pcm,
-                        'rate': rate or DEFAULT_SAMPLE_RATE,
-                        'name': f"{pkg_name}_b{si}"
-                    })
+            hdr = data[off:pcm_base]
+            avail = data_len - pcm_base
+
+            for si, buf_off, rate, length in _parse_bank_sounds(hdr, size, avail):
+                add_pkg_file(pfile)
+                add_header_off(off)
+                add_pcm_offset(buf_off)
+                add_pcm_length(length)
+                add_rate(rate or DEFAULT_SAMPLE_RATE)
+                add_name(f"{pkg_name}_b{si}")
+
+    def get_pcm(self, idx):
+        """Raw PCM of sound `idx`: its replacement, or read from its package."""
+        pcm = self._replaced.get(idx)
+        if pcm is None:
+            with open(self.pkg_files[idx], 'rb') as f:
+                f.seek(self.header_offs[idx] + BANK_HEADER_SIZE + self.pcm_offsets[idx])
+                pcm = f.read(self.pcm_lengths[idx])
+        return pcm
 
     def export(self, idx, out_dir):
-        s = self.sounds[idx]
-        wav = self._wrap_wav(s['pcm'], s['rate'])
-        out_path = Path(out_dir) / f"{s['name']}.wav"
-        out_path.write_bytes(wav)
+        pcm = self.get_pcm(idx)
+        out_path = Path(out_dir) / f"{self.names[idx]}.wav"
+        # Header and PCM go out back to back; the PCM is never copied into
+        # a joined buffer first
+        with open(out_path, 'wb') as f:
+            f.writelines((wav_header(len(pcm), self.rates[idx]), pcm))
 
     def export_all(self, out_dir, progress_callback=None):
-        total = len(self.sounds)
-        for i in range(total):
-            self.export(i, out_dir)
-            if progress_callback:
-                progress_callback(i + 1, total)
+        export_parallel(self.export, len(self.names), out_dir, progress_callback)
 
     def replace(self, idx, newfile):
         with wave.open(newfile, 'rb') as wf:
             pcm = wf.readframes(wf.getnframes())
-        self.sounds[idx]['pcm'] = pcm
+        self._replaced[idx] = pcm
+        self._wav_cache.pop(idx, None)
+        self._dirty.add(idx)
 
     def rebuild(self, progress_callback=None):
-        pkg_map = defaultdict(list)
-        for s in self.sounds:
-            pkg_map[s['pkg_file']].append(s)
+        # Only replaced sounds are written back, and packages without any
+        # are not opened at all
+        dirty = sorted(self._dirty)
+        pkg_map = defaultdict(list)  # pkg_file -> list of (pcm_start, pcm)
+        for idx in dirty:
+            start = self.header_offs[idx] + BANK_HEADER_SIZE + self.pcm_offsets[idx]
+            pkg_map[self.pkg_files[idx]].append((start, self._replaced[idx]))
+
+        # Packages are independent files, so patch them concurrently
+        total = len(pkg_map)
+        with ThreadPoolExecutor(max_workers=IO_WORKERS) as ex:
+            done = ex.map(lambda item: self._rebuild_package(*item), pkg_map.items())
+            for i, _ in enumerate(done, 1):
+                if progress_callback:
+                    progress_callback(i, total)
+        self._dirty.difference_update(dirty)
+
+    def _rebuild_package(self, pfile, patches):
+        # Write just the replaced ranges in place; nothing else in the
+        # package is read or rewritten
+        with open(pfile, 'r+b') as f:
+            data_len = os.fstat(f.fileno()).st_size
+            for start, pcm in patches:
+                end = start + len(pcm)
+                if 0 <= start < data_len and end <= data_len:
+                    f.seek(start)
+                    f.write(pcm)
 
-        for pfile, sounds in pkg_map.items():
-            orig = bytearray(pfile.read_bytes())
-            data_len = len(orig)
+    def get_wav(self, idx):
+        """WAV bytes for sound `idx`, reusing recently wrapped ones (LRU)."""
+        wav = self._wav_cache.get(idx)
+        if wav is not None:
+            self._wav_cache.move_to_end(idx)
+            return wav
 
-            for s in sounds:
-                start = s['header_off'] + BANK_HEADER_SIZE + s['pcm_offset']
-                end = start + len(s['pcm'])
-                if 0 <= start < data_len and end <= data_len:
-                    orig[start:end] = s['pcm']
-            pfile.write_bytes(orig)
+        wav = self._wav_cache[idx] = self._wrap_wav(self.get_pcm(idx), self.rates[idx])
+        if len(self._wav_cache) > WAV_CACHE_SIZE:
+            self._wav_cache.popitem(last=False)
+        return wav
 
     def _wrap_wav(self, pcm, rate):
-        buf = io.BytesIO()
-        wf = wave.open(buf, 'wb')
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(rate)
-        wf.writeframes(pcm)
-        wf.close()
-        return buf.getvalue()
+        return wav_header(len(pcm), rate) + pcm
 
 
 class App(tk.Tk):
@@ -300,21 +622,37 @@ class App(tk.Tk):
         self.title('GTA SA Audio Editor')
         self.geometry('600x450')  # slightly taller to fit time controls
 
-        pygame.init()
-        pygame.mixer.init()
+        # The mixer is opened on first Play (see _ensure_mixer)
+        self._sfx_channel = None
 
         self.stream_arc = None
         self.sfx_arc = None
 
         # For playback tracking
-        self.current_stream_temp = None
+        self.current_stream_data = None  # OGG bytes of the playing track
+        self._stream_buf = None  # file object pygame.mixer.music reads from
         self.current_duration = 0.0
 
         self.current_sound = None
         self.current_sfx_length = 0.0
         self.sfx_start_time = 0.0
+        self._sfx_sounds = OrderedDict()  # idx -> Sound, least recent first
+
+        # Latest (value, total) from a worker and whether a redraw is queued
+        self._progress_state = (0, 0)
+        self._progress_pending = False
+
+        # Pending time-loop callbacks and the text each time label shows
+        self._time_after = None
+        self._sfx_time_after = None
+        self._shown_time = {}
+        # Pending debounced seeks, one per slider
+        self._seek_after = None
+        self._sfx_seek_after = None
+        self._closed = False  # set once the window is being destroyed
 
         self._build_ui()
+        self.protocol('WM_DELETE_WINDOW', self._on_exit)
 
     def _build_ui(self):
         self._create_menu()
@@ -333,12 +671,7 @@ class App(tk.Tk):
         self.config(menu=menu)
 
     def _on_exit(self):
-        # Clean up any temp files
-        if self.current_stream_temp:
-            try:
-                Path(self.current_stream_temp).unlink()
-            except Exception:
-                pass
+        self._closed = True
         self.destroy()
 
     def _build_stream_tab(self, notebook):
@@ -434,10 +767,7 @@ class App(tk.Tk):
         if not path:
             return
 
-        def progress_cb(v, t):
-            self.after(0, self._update_progress, v, t)
-
-        arc = StreamArchive(path, progress_callback=progress_cb)
+        arc = StreamArchive(path, progress_callback=self._report_progress)
         self.stream_arc = arc
 
         names = [t['name'] for t in arc.tracks]
@@ -449,35 +779,28 @@ class App(tk.Tk):
         if not root:
             return
 
-        def progress_cb(v, t):
-            self.after(0, self._update_progress, v, t)
-
-        arc = SFXArchive(root, progress_callback=progress_cb)
+        arc = SFXArchive(root, progress_callback=self._report_progress)
         self.sfx_arc = arc
+        self._sfx_sounds.clear()
 
-        names = [s['name'] for s in arc.sounds]
-        self.after(0, lambda: self._populate_listbox(self.sfx_listbox, names))
+        self.after(0, lambda: self._populate_listbox(self.sfx_listbox, arc.names))
 
     def _populate_listbox(self, lb: tk.Listbox, items):
         lb.delete(0, tk.END)
-        for name in items:
-            lb.insert(tk.END, name)
+        # One Tcl call for the whole list instead of one per row
+        lb.insert(tk.END, *items)
 
     @run_in_thread
     def batch_export_stream(self):
         out = filedialog.askdirectory(title='Expt All Stream to:')
         if out and self.stream_arc:
-            def progress_cb(v, t):
-                self.after(0, self._update_progress, v, t)
-            self.stream_arc.export_all(out, progress_callback=progress_cb)
+            self.stream_arc.export_all(out, progress_callback=self._report_progress)
 
     @run_in_thread
     def batch_export_sfx(self):
         out = filedialog.askdirectory(title='Expt All SFX to:')
         if out and self.sfx_arc:
-            def progress_cb(v, t):
-                self.after(0, self._update_progress, v, t)
-            self.sfx_arc.export_all(out, progress_callback=progress_cb)
+            self.sfx_arc.export_all(out, progress_callback=self._report_progress)
 
     def export_track(self):
         sel = self.stream_listbox.curselection()
@@ -510,97 +833,130 @@ class App(tk.Tk):
             nf = filedialog.askopenfilename(filetypes=[('WAV', '*.wav')])
             if nf:
                 self.sfx_arc.replace(idx, nf)
+                self._sfx_sounds.pop(idx, None)
                 messagebox.showinfo('SFX Replaced', 'Replacement successful')
 
     @run_in_thread
     def rebuild_stream(self):
         if self.stream_arc:
-            def progress_cb(v, t):
-                self.after(0, self._update_progress, v, t)
-            self.stream_arc.rebuild(progress_callback=progress_cb)
+            self.stream_arc.rebuild(progress_callback=self._report_progress)
             self.after(0, lambda: messagebox.showinfo('Stream Rebuilt', 'Done'))
 
     @run_in_thread
     def rebuild_sfx(self):
         if self.sfx_arc:
-            def progress_cb(v, t):
-                self.after(0, self._update_progress, v, t)
-            self.sfx_arc.rebuild(progress_callback=progress_cb)
+            self.sfx_arc.rebuild(progress_callback=self._report_progress)
             self.after(0, lambda: messagebox.showinfo('SFX Rebuilt', 'All banks rebuilt'))
 
+    def _ensure_mixer(self):
+        """Open the audio device on first use; False if it can't be opened."""
+        if pygame.mixer.get_init():
+            return True
+        try:
+            pygame.mixer.init(buffer=MIXER_BUFFER)
+        except pygame.error as e:
+            messagebox.showerror("Playback Error", f"Could not open audio device: {e}")
+            return False
+
+        # SFX always play on one reserved channel, so starting a sound
+        # replaces the previous one
+        pygame.mixer.set_reserved(1)
+        self._sfx_channel = pygame.mixer.Channel(0)
+        return True
+
     def play_stream(self):
         sel = self.stream_listbox.curselection()
         if not sel or not self.stream_arc:
             messagebox.showwarning("No track", "Select a track first.")
             return
+        if not self._ensure_mixer():
+            return
 
         idx = sel[0]
         data = self.stream_arc.tracks[idx]['data']
-        tf = tempfile.NamedTemporaryFile(suffix='.ogg', delete=False)
-        tf.write(data)
-        tf.close()
 
         self.stop_stream()
 
         try:
-            pygame.mixer.music.load(tf.name)
+            self._load_music(data)
         except pygame.error as e:
             messagebox.showerror("Playback Error", f"Could not load OGG: {e}")
-            Path(tf.name).unlink(missing_ok=True)
             return
 
-        # Determine total duration
-        try:
-            sound_obj = pygame.mixer.Sound(tf.name)
-            self.current_duration = sound_obj.get_length()
-        except pygame.error:
-            self.current_duration = 0.0
+        # Determine total duration from the Ogg pages; only decode the
+        # whole track if they can't be read
+        self.current_duration = ogg_duration(data)
+        if self.current_duration is None:
+            try:
+                sound_obj = pygame.mixer.Sound(file=io.BytesIO(data))
+                self.current_duration = sound_obj.get_length()
+            except pygame.error:
+                self.current_duration = 0.0
 
-        self.current_stream_temp = tf.name
+        self.current_stream_data = data
         pygame.mixer.music.play()
 
         # Enable slider & start polling
         self.seek_slider.state(['!disabled'])
         self._update_time_loop()
 
+    def _load_music(self, data):
+        # Play straight from memory. pygame reads the file object lazily,
+        # so keep a reference to it for as long as the music plays
+        self._stream_buf = io.BytesIO(data)
+        pygame.mixer.music.load(self._stream_buf, 'ogg')
+
     def stop_stream(self):
-        if pygame.mixer.music.get_busy():
+        if pygame.mixer.get_init() and pygame.mixer.music.get_busy():
             pygame.mixer.music.stop()
-        if self.current_stream_temp:
-            try:
-                Path(self.current_stream_temp).unlink()
-            except Exception:
-                pass
-            self.current_stream_temp = None
+        self.current_stream_data = None
 
         # Reset UI
-        self.time_label.config(text="00:00 / 00:00")
+        self._show_time(self.time_label, "00:00 / 00:00")
         self.seek_slider.config(value=0.0)
         self.seek_slider.state(['disabled'])
 
+    def _show_time(self, label, text):
+        # The text only changes once a second; skip the Tk call otherwise
+        if self._shown_time.get(label) != text:
+            self._shown_time[label] = text
+            label.config(text=text)
+
     def _update_time_loop(self):
+        # Play and seek restart the loop, so drop any tick still queued
+        if self._time_after:
+            self.after_cancel(self._time_after)
+            self._time_after = None
+
         if not pygame.mixer.music.get_busy():
             # Playback stopped or finished
-            self.time_label.config(text="00:00 / 00:00")
+            self._show_time(self.time_label, "00:00 / 00:00")
             self.seek_slider.config(value=0.0)
             return
 
         pos_ms = pygame.mixer.music.get_pos()
         if pos_ms < 0:
-            self.after(100, self._update_time_loop)
+            self._time_after = self.after(TIME_POLL_MS, self._update_time_loop)
             return
 
         current_secs = pos_ms / 1000.0
         total = self.current_duration or 1.0
         cur_m, cur_s = divmod(int(current_secs), 60)
         tot_m, tot_s = divmod(int(total), 60)
-        self.time_label.config(text=f"{cur_m:02d}:{cur_s:02d} / {tot_m:02d}:{tot_s:02d}")
+        self._show_time(self.time_label, f"{cur_m:02d}:{cur_s:02d} / {tot_m:02d}:{tot_s:02d}")
         self.seek_slider.config(value=min(current_secs / total, 1.0))
 
-        self.after(100, self._update_time_loop)
+        self._time_after = self.after(TIME_POLL_MS, self._update_time_loop)
 
     def on_seek(self, slider_value):
-        if not self.current_stream_temp or self.current_duration <= 0:
+        # The slider fires on every step of a drag; only seek once it settles
+        if self._seek_after:
+            self.after_cancel(self._seek_after)
+        self._seek_after = self.after(SEEK_DEBOUNCE_MS, self._seek_stream, slider_value)
+
+    def _seek_stream(self, slider_value):
+        self._seek_after = None
+        if self.current_stream_data is None or self.current_duration <= 0:
             return
 
         ratio = float(slider_value)
@@ -610,7 +966,7 @@ class App(tk.Tk):
             pygame.mixer.music.play(start=target)
         except TypeError:
             pygame.mixer.music.stop()
-            pygame.mixer.music.load(self.current_stream_temp)
+            self._load_music(self.current_stream_data)
             try:
                 pygame.mixer.music.set_pos(target)
             except Exception:
@@ -624,39 +980,48 @@ class App(tk.Tk):
         if not sel or not self.sfx_arc:
             messagebox.showwarning("No sound", "Select an SFX first.")
             return
+        if not self._ensure_mixer():
+            return
 
         idx = sel[0]
-        snd = self.sfx_arc.sounds[idx]
-        wav = self.sfx_arc._wrap_wav(snd['pcm'], snd['rate'])
-        if self.current_sound:
-            self.current_sound.stop()
 
-        # Load into Sound and play
-        sound_obj = pygame.mixer.Sound(buffer=wav)
+        # Replaying a recent sound reuses its Sound instead of rebuilding it
+        sound_obj = self._sfx_sounds.get(idx)
+        if sound_obj is None:
+            sound_obj = pygame.mixer.Sound(buffer=self.sfx_arc.get_wav(idx))
+            self._sfx_sounds[idx] = sound_obj
+            if len(self._sfx_sounds) > SOUND_CACHE_SIZE:
+                self._sfx_sounds.popitem(last=False)
+        else:
+            self._sfx_sounds.move_to_end(idx)
         self.current_sound = sound_obj
         self.current_sfx_length = sound_obj.get_length()
         self.sfx_start_time = time.time()
 
-        sound_obj.play()
+        self._sfx_channel.play(sound_obj)
 
         # Enable slider & start polling
         self.sfx_seek_slider.state(['!disabled'])
         self._update_sfx_time_loop()
 
     def stop_sfx(self):
-        if self.current_sound:
-            self.current_sound.stop()
+        if self._sfx_channel:
+            self._sfx_channel.stop()
         self.current_sound = None
 
         # Reset UI
-        self.sfx_time_label.config(text="00:00 / 00:00")
+        self._show_time(self.sfx_time_label, "00:00 / 00:00")
         self.sfx_seek_slider.config(value=0.0)
         self.sfx_seek_slider.state(['disabled'])
 
     def _update_sfx_time_loop(self):
-        if not self.current_sound or not pygame.mixer.get_busy():
+        if self._sfx_time_after:
+            self.after_cancel(self._sfx_time_after)
+            self._sfx_time_after = None
+
+        if not self.current_sound or not self._sfx_channel.get_busy():
             # Playback finished
-            self.sfx_time_label.config(text="00:00 / 00:00")
+            self._show_time(self.sfx_time_label, "00:00 / 00:00")
             self.sfx_seek_slider.config(value=0.0)
             return
 
@@ -664,12 +1029,18 @@ class App(tk.Tk):
         total = self.current_sfx_length or 1.0
         cur_m, cur_s = divmod(int(elapsed), 60)
         tot_m, tot_s = divmod(int(total), 60)
-        self.sfx_time_label.config(text=f"{cur_m:02d}:{cur_s:02d} / {tot_m:02d}:{tot_s:02d}")
+        self._show_time(self.sfx_time_label, f"{cur_m:02d}:{cur_s:02d} / {tot_m:02d}:{tot_s:02d}")
         self.sfx_seek_slider.config(value=min(elapsed / total, 1.0))
 
-        self.after(100, self._update_sfx_time_loop)
+        self._sfx_time_after = self.after(TIME_POLL_MS, self._update_sfx_time_loop)
 
     def on_sfx_seek(self, slider_value):
+        if self._sfx_seek_after:
+            self.after_cancel(self._sfx_seek_after)
+        self._sfx_seek_after = self.after(SEEK_DEBOUNCE_MS, self._seek_sfx, slider_value)
+
+    def _seek_sfx(self, slider_value):
+        self._sfx_seek_after = None
         if not self.current_sound or self.current_sfx_length <= 0:
             return
 
@@ -680,30 +1051,44 @@ class App(tk.Tk):
         # Convert PCM to NumPy for precise slicing is more accurate,
         # but here we restart from approximate time by reloading buffer.
         idx = self.sfx_listbox.curselection()[0]
-        snd = self.sfx_arc.sounds[idx]
-        pcm = snd['pcm']
-        rate = snd['rate']
+        pcm = self.sfx_arc.get_pcm(idx)
+        rate = self.sfx_arc.rates[idx]
         total_samples = len(pcm) // 2  # 2 bytes per sample
 
         sample_target = int(ratio * total_samples)
-        # slice raw PCM from sample_target onward
-        pcm_array = pcm[sample_target*2:]
+        # View raw PCM from sample_target onward; the WAV concat below is
+        # then the only copy made
+        pcm_array = memoryview(pcm)[sample_target*2:]
         wav = self.sfx_arc._wrap_wav(pcm_array, rate)
 
-        if self.current_sound:
-            self.current_sound.stop()
-
         new_sound = pygame.mixer.Sound(buffer=wav)
         self.current_sound = new_sound
         self.current_sfx_length = new_sound.get_length()
         self.sfx_start_time = time.time()
-        new_sound.play()
+        self._sfx_channel.play(new_sound)
 
         self._update_sfx_time_loop()
 
+    def _report_progress(self, val, total):
+        # Called from worker threads: keep only the newest value and queue
+        # one redraw per interval instead of one Tk event per callback
+        # Once the window is gone there is nothing left to update
+        if self._closed:
+            return
+        self._progress_state = (val, total)
+        if not self._progress_pending:
+            self._progress_pending = True
+            try:
+                self.after(PROGRESS_INTERVAL_MS, self._flush_progress)
+            except (tk.TclError, RuntimeError):
+                pass  # root destroyed between the check and the call
+
+    def _flush_progress(self):
+        self._progress_pending = False
+        self._update_progress(*self._progress_state)
+
     def _update_progress(self, val, total):
         self.progress.config(maximum=total, value=val)
-        self.update_idletasks()
 
 
 if __name__ == '__main__':